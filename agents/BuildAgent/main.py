@@ -6,6 +6,74 @@ import sys
 import os
 import shutil
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _spawn import popen, run  # noqa: E402
+from _stamp import compute_digest, is_fresh, iter_files, write_stamp  # noqa: E402
+
+# Inputs that determine the build output; relative to the project root
+BUILD_INPUTS = ['CMakeLists.txt', 'bootloader', 'kernel', 'userspace', 'tests']
+# Environment variables that change how the toolchain compiles the tree
+TOOLCHAIN_VARS = ['CC', 'CXX', 'CFLAGS', 'CXXFLAGS', 'LDFLAGS']
+STAMP_NAME = '.metalos_build_stamp'
+# The stamp only covers inputs, so it is trusted only while the configured
+# build tree is still there for cmake --build to bring up to date
+GENERATOR_FILES = ['build.ninja', 'Makefile']
+CHUNK_SIZE = 64 * 1024
+# Grace period for the build to exit after SIGTERM before it is killed
+TERMINATE_TIMEOUT = 5
+
+
+def run_streamed(cmd):
+    """Run cmd, forwarding its combined output as it arrives.
+
+    Returns (returncode, output line count, elapsed seconds). On Ctrl-C the
+    child is terminated, then killed if it doesn't exit in time.
+    """
+    # Only needed when a build actually runs, not on the up-to-date path
+    import selectors
+    import time
+
+    start = time.monotonic()
+    lines = 0
+    last = b'\n'
+    proc = popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    out = sys.stdout.buffer
+    try:
+        with selectors.DefaultSelector() as sel:
+            sel.register(proc.stdout, selectors.EVENT_READ)
+            while sel.get_map():
+                for key, _ in sel.select():
+                    data = os.read(key.fd, CHUNK_SIZE)
+                    if not data:
+                        sel.unregister(key.fileobj)
+                        continue
+                    lines += data.count(b'\n')
+                    last = data[-1:]
+                    out.write(data)
+                    out.flush()
+        if last != b'\n':
+            out.write(b'\n')
+        returncode = proc.wait()
+    except KeyboardInterrupt:
+        proc.terminate()
+        try:
+            proc.wait(timeout=TERMINATE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        raise
+    finally:
+        proc.stdout.close()
+    return returncode, lines, time.monotonic() - start
+
+
+def build_tree_present(build_dir):
+    """Return True if build_dir holds a configured CMake build tree."""
+    return os.path.isfile(os.path.join(build_dir, 'CMakeCache.txt')) and any(
+        os.path.isfile(os.path.join(build_dir, name)) for name in GENERATOR_FILES
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="BuildAgent: run CMake build for the project"
@@ -24,6 +92,17 @@ def main():
         action='store_true',
         help='Clean the build directory before building'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Number of parallel build jobs (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--force', '-f',
+        action='store_true',
+        help='Build even if no inputs changed since the last successful build'
+    )
     args = parser.parse_args()
     build_dir = args.build_dir
 
@@ -31,25 +110,44 @@ def main():
         print(f"Cleaning build directory: {build_dir}")
         shutil.rmtree(build_dir)
 
+    # Skip the build entirely if nothing changed since the last success
+    stamp_path = os.path.join(build_dir, STAMP_NAME)
+    build_args = {
+        'config': args.config,
+        'env': {var: os.environ.get(var) for var in TOOLCHAIN_VARS},
+    }
+    digest = compute_digest(iter_files(BUILD_INPUTS), build_args)
+    if not args.force and build_tree_present(build_dir) and is_fresh(stamp_path, digest):
+        print("Build up-to-date.")
+        sys.exit(0)
+
     # Configure step
     if not os.path.isdir(build_dir):
         print(f"Configuring project in {build_dir}...")
-        ret = subprocess.run(['cmake', '-S', '.', '-B', build_dir])
+        configure_cmd = ['cmake', '-S', '.', '-B', build_dir]
+        if shutil.which('ninja'):
+            configure_cmd.extend(['-G', 'Ninja'])
+        ret = run(configure_cmd)
         if ret.returncode != 0:
             print("Configuration failed.", file=sys.stderr)
             sys.exit(ret.returncode)
 
     # Build step
-    build_cmd = ['cmake', '--build', build_dir]
+    build_cmd = ['cmake', '--build', build_dir, '--parallel', str(args.jobs)]
     if args.config:
         build_cmd.extend(['--config', args.config])
-    print("Building project...")
-    ret = subprocess.run(build_cmd)
-    if ret.returncode != 0:
-        print("Build failed.", file=sys.stderr)
-        sys.exit(ret.returncode)
+    print("Building project...", flush=True)
+    try:
+        returncode, lines, elapsed = run_streamed(build_cmd)
+    except KeyboardInterrupt:
+        print("Build interrupted.", file=sys.stderr)
+        sys.exit(130)
+    if returncode != 0:
+        print(f"Build failed after {elapsed:.1f}s.", file=sys.stderr)
+        sys.exit(returncode)
 
-    print("Build succeeded.")
+    write_stamp(stamp_path, digest, build_args)
+    print(f"Build succeeded in {elapsed:.1f}s ({lines} lines of output).")
     sys.exit(0)
 
 if __name__ == '__main__':
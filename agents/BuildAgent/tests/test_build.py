@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).parent.parent / 'main.py'
+FAKE_CMAKE = """#!/bin/sh
+if [ "$1" = "--build" ]; then
+    echo "building"
+    exit "${FAKE_BUILD_RC:-0}"
+fi
+mkdir -p "$4"
+touch "$4/CMakeCache.txt" "$4/Makefile"
+"""
+
+
+def setup_project(tmp_path, build_rc):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    cmake = bin_dir / 'cmake'
+    cmake.write_text(FAKE_CMAKE)
+    cmake.chmod(0o755)
+    (tmp_path / 'CMakeLists.txt').write_text('project(T C)\n')
+    env = dict(os.environ)
+    env['PATH'] = f"{bin_dir}{os.pathsep}{env['PATH']}"
+    env['FAKE_BUILD_RC'] = str(build_rc)
+    return env
+
+
+def run_build(tmp_path, env, *args):
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), *args],
+        cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+
+
+def test_successful_build_is_skipped_next_time(tmp_path):
+    env = setup_project(tmp_path, 0)
+    result = run_build(tmp_path, env)
+    assert result.returncode == 0
+    assert 'building' in result.stdout
+    assert (tmp_path / 'build' / '.metalos_build_stamp').exists()
+
+    result = run_build(tmp_path, env)
+    assert result.returncode == 0
+    assert result.stdout.strip() == 'Build up-to-date.'
+
+    env['CC'] = 'clang'
+    result = run_build(tmp_path, env)
+    assert 'building' in result.stdout
+
+
+def test_missing_build_tree_is_rebuilt(tmp_path):
+    env = setup_project(tmp_path, 0)
+    assert run_build(tmp_path, env).returncode == 0
+    (tmp_path / 'build' / 'Makefile').unlink()
+
+    result = run_build(tmp_path, env)
+    assert result.returncode == 0
+    assert 'building' in result.stdout
+
+
+def test_failed_build_writes_no_stamp(tmp_path):
+    env = setup_project(tmp_path, 3)
+    result = run_build(tmp_path, env)
+    assert result.returncode == 3
+    assert not (tmp_path / 'build' / '.metalos_build_stamp').exists()
+
+    result = run_build(tmp_path, env)
+    assert result.returncode == 3
+    assert 'building' in result.stdout
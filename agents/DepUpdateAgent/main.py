@@ -1,36 +1,31 @@
 #!/usr/bin/env python3
 
 import argparse
-import subprocess
 import sys
 import os
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _fscache import isfile  # noqa: E402
+from _pip import pip_install_cmd  # noqa: E402
+from _spawn import run_all  # noqa: E402
 
-def update_requirements():
-    if os.path.isfile('requirements.txt'):
-        print("Updating Python dependencies from requirements.txt...")
-        ret = subprocess.run([sys.executable, '-m', 'pip', 'install', '--upgrade', '-r', 'requirements.txt'])
-        if ret.returncode != 0:
-            return ret.returncode
-    return 0
 
+def requirements_cmd():
+    if isfile('requirements.txt'):
+        return pip_install_cmd(['-r', 'requirements.txt'])
+    return None
 
-def update_conan():
-    if os.path.isfile('conanfile.py') or os.path.isfile('conanfile.txt'):
-        print("Updating Conan dependencies...")
-        ret = subprocess.run(['conan', 'install', '.'])
-        if ret.returncode != 0:
-            return ret.returncode
-    return 0
 
+def conan_cmd():
+    if isfile('conanfile.py') or isfile('conanfile.txt'):
+        return ['conan', 'install', '.']
+    return None
 
-def update_npm():
-    if os.path.isfile('package.json'):
-        print("Updating npm dependencies...")
-        ret = subprocess.run(['npm', 'update'])
-        if ret.returncode != 0:
-            return ret.returncode
-    return 0
+
+def npm_cmd():
+    if isfile('package.json'):
+        return ['npm', 'update']
+    return None
 
 
 def main():
@@ -44,14 +39,32 @@ def main():
     )
     args = parser.parse_args()
 
-    # Run updates
+    # The updaters are independent, so run them concurrently
+    updates = []
+    if args.all or isfile('requirements.txt'):
+        updates.append(('pip', "Updating Python dependencies from requirements.txt...", requirements_cmd()))
+    if args.all or isfile('conanfile.py') or isfile('conanfile.txt'):
+        updates.append(('conan', "Updating Conan dependencies...", conan_cmd()))
+    if args.all or isfile('package.json'):
+        updates.append(('npm', "Updating npm dependencies...", npm_cmd()))
+    updates = [update for update in updates if update[2]]
+    for _, message, _ in updates:
+        print(message)
+
     status = 0
-    if args.all or os.path.isfile('requirements.txt'):
-        status |= update_requirements()
-    if args.all or os.path.isfile('conanfile.py') or os.path.isfile('conanfile.txt'):
-        status |= update_conan()
-    if args.all or os.path.isfile('package.json'):
-        status |= update_npm()
+    results = dict(run_all([cmd for _, _, cmd in updates], capture_output=True, text=True))
+
+    # Print buffered output in a fixed order so logs don't interleave
+    for index, (name, _, _) in enumerate(updates):
+        ret = results[index]
+        if ret.stdout:
+            print(f"[{name}]")
+            sys.stdout.write(ret.stdout)
+        if ret.stderr:
+            sys.stderr.write(ret.stderr)
+        if ret.returncode != 0:
+            print(f"{name} update failed.", file=sys.stderr)
+        status |= ret.returncode
 
     if status != 0:
         print("Dependency update encountered errors.", file=sys.stderr)
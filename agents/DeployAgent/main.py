@@ -1,9 +1,27 @@
 #!/usr/bin/env python3
 
 import argparse
-import subprocess
+import os
+import shutil
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _spawn import run  # noqa: E402
+
+EXTENSIONS = {'gzip': '.tar.gz', 'zstd': '.tar.zst', 'none': '.tar'}
+
+
+def tar_command(compressor, tarball):
+    if compressor == 'zstd':
+        # Multi-threaded with long-distance matching; default level keeps it fast
+        return ['tar', '--use-compress-program', 'zstd -T0 --long', '-cf', tarball]
+    if compressor == 'gzip':
+        if shutil.which('pigz'):
+            # Parallel gzip: compression is the bottleneck for large build dirs
+            return ['tar', '--use-compress-program', f"pigz -p {os.cpu_count() or 1}", '-cf', tarball]
+        return ['tar', '-czf', tarball]
+    return ['tar', '-cf', tarball]
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -25,19 +43,25 @@ def main():
         help='Version tag for deployment',
         default=None
     )
+    parser.add_argument(
+        '--compressor',
+        choices=['gzip', 'zstd', 'none'],
+        default='zstd' if shutil.which('zstd') else 'gzip',
+        help='Tarball compression (default: zstd if installed, otherwise gzip)'
+    )
     args = parser.parse_args()
 
     # Example: create tarball and call deployment script
-    tarball = f"{args.build_dir}.tar.gz"
+    tarball = f"{args.build_dir}{EXTENSIONS[args.compressor]}"
     print(f"Packaging {args.build_dir} into {tarball}...")
-    ret = subprocess.run(['tar', '-czf', tarball, '-C', args.build_dir, '.'])
+    ret = run(tar_command(args.compressor, tarball) + ['-C', args.build_dir, '.'])
     if ret.returncode != 0:
         print("Packaging failed.", file=sys.stderr)
         sys.exit(ret.returncode)
 
     print(f"Deploying {tarball} to {args.target}...")
     # Placeholder: call actual deploy script or API
-    # ret = subprocess.run(['./scripts/deploy.sh', tarball, args.target, args.version])
+    # ret = run(['./scripts/deploy.sh', tarball, args.target, args.version])
     ret = 0
 
     if ret != 0:
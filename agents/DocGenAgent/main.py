@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
 
 import argparse
-import subprocess
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _spawn import run  # noqa: E402
+from _stamp import compute_digest, is_fresh, iter_files, write_stamp  # noqa: E402
+
+DOCS_DIR = 'docs'
+# Source types Sphinx reads; conf.py is covered by .py
+DOC_SUFFIXES = ('.rst', '.md', '.py')
+STAMP_NAME = '.docgen_stamp'
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -14,17 +23,33 @@ def main():
         default='docs/_build',
         help='Output directory for generated docs'
     )
+    parser.add_argument(
+        '--force', '-f',
+        action='store_true',
+        help='Rebuild even if no sources changed since the last successful build'
+    )
     args = parser.parse_args()
 
+    # Skip Sphinx entirely if no sources changed since the last success
+    stamp_path = os.path.join(args.output_dir, STAMP_NAME)
+    build_cmd = ['sphinx-build', '-j', 'auto', '-b', 'html', DOCS_DIR, args.output_dir]
+    digest = compute_digest(
+        iter_files([DOCS_DIR], DOC_SUFFIXES, exclude=[args.output_dir]), build_cmd
+    )
+    if not args.force and is_fresh(stamp_path, digest):
+        print("Docs up-to-date.")
+        sys.exit(0)
+
     # Generate docs (e.g., Sphinx)
     print(f"Building docs in {args.output_dir}...")
-    ret = subprocess.run(['sphinx-build', '-b', 'html', 'docs', args.output_dir])
+    ret = run(build_cmd)
     if ret.returncode != 0:
         print("Documentation build failed.", file=sys.stderr)
         sys.exit(ret.returncode)
+    write_stamp(stamp_path, digest, build_cmd)
 
     # Optionally validate
-    # ret = subprocess.run(['sphinx-build', '-b', 'linkcheck', 'docs', args.output_dir])
+    # ret = run(['sphinx-build', '-b', 'linkcheck', 'docs', args.output_dir])
     # if ret.returncode != 0:
     #     print("Documentation validation failed.", file=sys.stderr)
     #     sys.exit(ret.returncode)
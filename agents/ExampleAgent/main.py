@@ -1,19 +1,28 @@
 #!/usr/bin/env python3
 
-import argparse
+import sys
+
+DEFAULT_MESSAGE = 'Hello from ExampleAgent!'
+USAGE = "usage: main.py [-h] [-m MESSAGE]"
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="ExampleAgent: sample micro agent"
-    )
-    parser.add_argument(
-        '--message', '-m',
-        help='Custom message to print',
-        default='Hello from ExampleAgent!'
-    )
-    args = parser.parse_args()
-    print(args.message)
+    # Parsed by hand: importing argparse costs more than everything this
+    # agent does, which adds up when orchestrators launch it repeatedly
+    message = DEFAULT_MESSAGE
+    args = sys.argv[1:]
+    while args:
+        arg = args.pop(0)
+        if arg in ('-h', '--help'):
+            print(f"{USAGE}\n\nExampleAgent: sample micro agent\n\n"
+                  "  -m, --message MESSAGE  Custom message to print")
+            return
+        if arg in ('-m', '--message') and args:
+            message = args.pop(0)
+        else:
+            print(f"{USAGE}\nmain.py: error: unrecognized arguments: {arg}", file=sys.stderr)
+            sys.exit(2)
+    print(message)
 
 
 if __name__ == '__main__':
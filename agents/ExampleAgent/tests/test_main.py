@@ -18,3 +18,30 @@ def test_custom_message():
     )
     assert result.returncode == 0
     assert result.stdout.strip() == custom
+
+def run_agent(*args):
+    script = Path(__file__).parent.parent / 'main.py'
+    return subprocess.run(
+        [sys.executable, str(script), *args], capture_output=True, text=True
+    )
+
+def test_message_value_starting_with_dash():
+    assert run_agent('-m', '-1').stdout.strip() == '-1'
+    assert run_agent('--message', '-x').stdout.strip() == '-x'
+
+def test_help():
+    result = run_agent('--help')
+    assert result.returncode == 0
+    assert result.stdout.startswith('usage: main.py [-h] [-m MESSAGE]')
+    assert '-m, --message MESSAGE' in result.stdout
+
+def test_missing_message_argument():
+    result = run_agent('-m')
+    assert result.returncode == 2
+    assert 'unrecognized arguments: -m' in result.stderr
+    assert result.stdout == ''
+
+def test_unrecognized_argument():
+    result = run_agent('--bogus')
+    assert result.returncode == 2
+    assert 'unrecognized arguments: --bogus' in result.stderr
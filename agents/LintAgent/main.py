@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
 import argparse
-import subprocess
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _spawn import run, run_all  # noqa: E402
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -21,17 +24,24 @@ def main():
         ['clang-tidy', '-p', 'build']
     ]
 
-    for cmd in linters:
-        print(f"Running {' '.join(cmd)}...")
-        ret = subprocess.run(cmd)
+    # Linters share no state, so run them concurrently and report each as it finishes
+    status = 0
+    print(f"Running {', '.join(cmd[0] for cmd in linters)}...")
+    for _, ret in run_all(linters, capture_output=True, text=True):
+        print(f"== {' '.join(ret.args)} ==")
+        sys.stdout.write(ret.stdout)
+        sys.stderr.write(ret.stderr)
         if ret.returncode != 0:
-            print(f"Linting failed: {' '.join(cmd)}", file=sys.stderr)
-            if not args.fix:
-                sys.exit(ret.returncode)
+            print(f"Linting failed: {' '.join(ret.args)}", file=sys.stderr)
+            status |= ret.returncode
+
+    if status != 0 and not args.fix:
+        sys.exit(status)
 
+    # Formatting rewrites files, so it runs only after all linters are done
     if args.fix:
         print("Auto-formatting with black...")
-        ret = subprocess.run(['black', '.'])
+        ret = run(['black', '.'])
         if ret.returncode != 0:
             print("Formatting failed.", file=sys.stderr)
             sys.exit(ret.returncode)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
@@ -26,18 +27,27 @@ def main():
         if not roadmap_path.exists():
             print(f"Roadmap file not found at {roadmap_path}", file=sys.stderr)
             sys.exit(1)
-        print(roadmap_path.read_text())
+        import shutil
+
+        # Copy the raw bytes through instead of decoding the whole file first
+        with roadmap_path.open('rb') as f:
+            shutil.copyfileobj(f, sys.stdout.buffer)
         sys.exit(0)
 
     if args.add:
         # Append new roadmap item
         entry = f"- {args.add}\n"
+        # A single O_APPEND write is atomic for small entries, so concurrent
+        # adders can't interleave or clobber each other's lines
         try:
-            with open(roadmap_path, 'a') as f:
-                f.write(entry)
+            fd = os.open(str(roadmap_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, entry.encode('utf-8'))
+            finally:
+                os.close(fd)
             print(f"Added roadmap item: {args.add}")
             sys.exit(0)
-        except Exception as e:
+        except OSError as e:
             print(f"Failed to update roadmap: {e}", file=sys.stderr)
             sys.exit(1)
 
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
 import argparse
-import subprocess
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _spawn import run  # noqa: E402
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -19,7 +22,7 @@ def main():
     if args.pattern:
         cmd.extend(['-k', args.pattern])
     print(f"Running test suite{' with pattern ' + args.pattern if args.pattern else ''}...")
-    ret = subprocess.run(cmd)
+    ret = run(cmd)
     sys.exit(ret.returncode)
 
 if __name__ == '__main__':
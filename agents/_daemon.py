@@ -0,0 +1,287 @@
+"""Persistent agent runner that amortizes interpreter startup across calls.
+
+The server (``--serve``) imports every agent once and listens on a Unix
+domain socket. For each request it forks a child that runs the agent's
+``main()`` with the caller's argv, cwd, and environment. The client passes
+its stdin/stdout/stderr descriptors over the socket (SCM_RIGHTS), so output
+from the agent and from any tools it launches goes straight to the caller's
+terminal. A request is a 4-byte big-endian length followed by a marshal
+frame ``{argv, cwd, env}``. The server replies with the child's pid and then
+its exit code, each as a 4-byte signed integer.
+
+The client starts the server on first use. The server exits after
+``IDLE_TIMEOUT`` seconds without requests.
+
+The client side is kept to builtin modules (marshal, _socket) because the
+launcher still pays for every import it makes. Only the server loads
+socketserver and the agents. marshal is safe here because both ends run as
+the same user: the socket lives in a private directory (see socket_path),
+and where SO_PEERCRED exists each end also checks the other's uid.
+"""
+
+import _socket
+import marshal
+import os
+import stat
+import struct
+import sys
+import time
+
+AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+IDLE_TIMEOUT = 600
+# How often the idle server wakes to reap finished children
+POLL_INTERVAL = 1.0
+START_TIMEOUT = 5.0
+_INT = struct.Struct('!i')
+_LEN = struct.Struct('!I')
+
+
+def _tree_id():
+    # One daemon per agents/ checkout and interpreter: the daemon serves the
+    # agent code it imported and runs pip etc. with its own sys.executable
+    try:
+        from _blake2 import blake2b
+    except ImportError:
+        from hashlib import blake2b
+    key = os.path.realpath(AGENTS_DIR) + '\0' + sys.executable
+    return blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def socket_path():
+    """Return the socket path inside a private directory owned by this user.
+
+    The directory is created 0700 and then verified, so another local user
+    can't plant a socket (or a symlink to one) that would receive our
+    environment and stdio descriptors. Its name includes ``_tree_id()`` so
+    launchers from other checkouts or venvs get their own daemon.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        sock_dir = os.path.join(runtime_dir, f'metalos-agentd-{_tree_id()}')
+    else:
+        sock_dir = os.path.join('/tmp', f'metalos-agentd-{os.getuid()}-{_tree_id()}')
+    try:
+        os.mkdir(sock_dir, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(sock_dir)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"refusing to use insecure agentd directory {sock_dir}")
+    return os.path.join(sock_dir, 'agentd.sock')
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("agentd connection closed")
+        data += chunk
+    return data
+
+
+def _load_agent(name, path):
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(f'metalos_agent_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_agents():
+    agents = {}
+    for name in sorted(os.listdir(AGENTS_DIR)):
+        path = os.path.join(AGENTS_DIR, name, 'main.py')
+        if os.path.isfile(path):
+            agents[name] = (_load_agent(name, path), os.stat(path).st_mtime_ns)
+    return agents
+
+
+def _run_agent(module, argv):
+    sys.argv = [module.__file__] + argv
+    try:
+        module.main()
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def serve():
+    import socket
+    import socketserver
+
+    agents = load_agents()
+
+    class Handler(socketserver.BaseRequestHandler):
+        # Runs in a forked child, so it may freely rebind fds, cwd and env
+        def handle(self):
+            sock = self.request
+            _check_peer(sock)
+            header, fds, _, _ = socket.recv_fds(sock, _LEN.size, 3)
+            (size,) = _LEN.unpack(header + _recv_exact(sock, _LEN.size - len(header)))
+            request = marshal.loads(_recv_exact(sock, size))
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            sys.stdin = os.fdopen(0, 'r', closefd=False)
+            sys.stdout = os.fdopen(1, 'w', buffering=1, closefd=False)
+            sys.stderr = os.fdopen(2, 'w', buffering=1, closefd=False)
+            sock.sendall(_INT.pack(os.getpid()))
+
+            name, argv = request['argv'][0], request['argv'][1:]
+            if name not in agents:
+                print(f"Unknown agent: {name}", file=sys.stderr)
+                sock.sendall(_INT.pack(2))
+                return
+            module, mtime_ns = agents[name]
+            # Pick up edits made since the daemon started
+            if os.stat(module.__file__).st_mtime_ns != mtime_ns:
+                module = _load_agent(name, module.__file__)
+            os.chdir(request['cwd'])
+            os.environ.clear()
+            os.environ.update(request['env'])
+            rc = _run_agent(module, argv)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            sock.sendall(_INT.pack(rc))
+
+    class Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        timeout = POLL_INTERVAL
+        idle = False
+        last_request = time.monotonic()
+
+        def process_request(self, request, client_address):
+            self.last_request = time.monotonic()
+            super().process_request(request, client_address)
+
+        def handle_timeout(self):
+            super().handle_timeout()
+            if not self.active_children and time.monotonic() - self.last_request > IDLE_TIMEOUT:
+                self.idle = True
+
+    path = socket_path()
+    try:
+        _connect(path).close()
+        return  # another daemon is already serving
+    except OSError:
+        pass
+    if os.path.exists(path):
+        os.unlink(path)
+    old_umask = os.umask(0o077)
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+    try:
+        while not server.idle:
+            server.handle_request()
+            # handle_request alone only reaps on timeout, so zombies would
+            # pile up for as long as requests keep arriving
+            server.collect_children()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _connect(path):
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        _check_peer(sock)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _check_peer(sock):
+    # Defense in depth on top of the private directory, where supported
+    if not hasattr(_socket, 'SO_PEERCRED'):
+        return
+    creds = sock.getsockopt(_socket.SOL_SOCKET, _socket.SO_PEERCRED, struct.calcsize('3i'))
+    _, uid, _ = struct.unpack('3i', creds)
+    if uid != os.getuid():
+        raise PermissionError(f"agentd peer runs as uid {uid}, not {os.getuid()}")
+
+
+def _connect_or_start(path):
+    try:
+        return _connect(path)
+    except OSError:
+        pass
+    import subprocess
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve'],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL, start_new_session=True,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while True:
+        try:
+            return _connect(path)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.02)
+
+
+def run_agent(argv):
+    """Run ``argv`` (agent name followed by its args) in the daemon; return its exit code."""
+    sock = _connect_or_start(socket_path())
+    try:
+        payload = marshal.dumps({
+            'argv': argv,
+            'cwd': os.getcwd(),
+            'env': dict(os.environ),
+        })
+        fds = struct.pack('3i', 0, 1, 2)
+        sock.sendmsg(
+            [_LEN.pack(len(payload)) + payload],
+            [(_socket.SOL_SOCKET, _socket.SCM_RIGHTS, fds)]
+        )
+        (pid,) = _INT.unpack(_recv_exact(sock, _INT.size))
+        while True:
+            try:
+                (rc,) = _INT.unpack(_recv_exact(sock, _INT.size))
+                return rc
+            except KeyboardInterrupt:
+                import signal
+
+                # Forward Ctrl-C to the agent and wait for it to wind down
+                os.kill(pid, signal.SIGINT)
+    finally:
+        sock.close()
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv == ['--serve']:
+        serve()
+        return
+    if not argv or argv[0] in ('-h', '--help'):
+        print("usage: metalos-agent AGENT [ARGS...]\n"
+              "       metalos-agent --serve")
+        sys.exit(0 if argv else 2)
+    try:
+        rc = run_agent(argv)
+    except (OSError, ConnectionError) as e:
+        print(f"metalos-agent: cannot reach agentd: {e}", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(rc)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""Per-process cache of file-system existence checks shared by the agents.
+
+Each agent is a one-shot CLI, so a path's existence is looked up at most once
+per run and never invalidated. Don't use these for paths the agent itself
+creates or removes.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=None)
+def isfile(path):
+    return os.path.isfile(path)
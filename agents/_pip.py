@@ -0,0 +1,21 @@
+"""pip helpers shared by the agents.
+
+Each pip run pays a second or more of interpreter and resolver startup, so
+agents should collect all their package specs and upgrade them in one call
+rather than looping over pip per package.
+"""
+
+import sys
+
+from _spawn import run
+
+
+def pip_install_cmd(specs):
+    return [sys.executable, '-m', 'pip', 'install', '--upgrade', *specs]
+
+
+def pip_batch(specs):
+    """Upgrade all of ``specs`` with a single pip invocation; return its exit code."""
+    if not specs:
+        return 0
+    return run(pip_install_cmd(specs)).returncode
@@ -0,0 +1,98 @@
+"""Subprocess helpers shared by the agents.
+
+CPython launches children with posix_spawn (vfork semantics) instead of
+fork+exec only when the executable path is already resolved, close_fds is
+off, and no cwd, preexec_fn, session, or credential changes are requested.
+fork has to copy the parent's page tables, so its cost grows with the
+parent's memory. These helpers keep calls on the posix_spawn path.
+Descriptors Python opens are non-inheritable by default (PEP 446), so
+close_fds=False does not leak them into the child.
+"""
+
+import os
+import shutil
+import subprocess
+
+
+def _spawn_kwargs(cmd, kwargs):
+    # Resolve the executable up front but leave argv[0] as given; if it isn't
+    # found, Popen raises FileNotFoundError exactly as before
+    kwargs.setdefault('executable', shutil.which(cmd[0]))
+    kwargs.setdefault('close_fds', False)
+    return kwargs
+
+
+def run(cmd, **kwargs):
+    """subprocess.run that keeps the posix_spawn fast path where possible."""
+    return subprocess.run(cmd, **_spawn_kwargs(cmd, kwargs))
+
+
+def popen(cmd, **kwargs):
+    """subprocess.Popen that keeps the posix_spawn fast path where possible."""
+    return subprocess.Popen(cmd, **_spawn_kwargs(cmd, kwargs))
+
+
+def run_all(cmds, capture_output=False, text=False):
+    """Start every command at once and yield ``(index, CompletedProcess)`` as each exits.
+
+    A single thread drives all children. It blocks in os.waitid(P_ALL), or
+    os.wait() where waitid is missing (macOS before Python 3.13), which
+    returns whichever child finishes first, so no thread sits in a per-child
+    wait. Captured output is spooled to temporary files rather than pipes, so
+    a chatty child can't stall on a full pipe while nothing is reading it.
+    Because P_ALL reaps any child, don't run other subprocesses alongside this.
+    """
+    procs = {}
+    outputs = {}
+    try:
+        for index, cmd in enumerate(cmds):
+            if capture_output:
+                import tempfile
+                out, err = tempfile.TemporaryFile(), tempfile.TemporaryFile()
+                outputs[index] = (out, err)
+                proc = popen(cmd, stdout=out, stderr=err)
+            else:
+                proc = popen(cmd)
+            procs[proc.pid] = (index, cmd, proc)
+
+        while procs:
+            pid, returncode = _wait_any()
+            if pid not in procs:
+                continue
+            index, cmd, proc = procs.pop(pid)
+            # Already reaped here, so record the status on the Popen ourselves
+            proc.returncode = returncode
+            stdout = stderr = None
+            if capture_output:
+                stdout, stderr = (_read_spooled(f, text) for f in outputs.pop(index))
+            yield index, subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+    finally:
+        for _, _, proc in procs.values():
+            proc.kill()
+            proc.wait()
+        for out, err in outputs.values():
+            out.close()
+            err.close()
+
+
+def _wait_any():
+    """Block until any child exits; return its pid and Popen-style returncode."""
+    if hasattr(os, 'waitid'):
+        info = os.waitid(os.P_ALL, 0, os.WEXITED)
+        if info.si_code == os.CLD_EXITED:
+            return info.si_pid, info.si_status
+        return info.si_pid, -info.si_status
+    pid, status = os.wait()
+    if os.WIFSIGNALED(status):
+        return pid, -os.WTERMSIG(status)
+    return pid, os.WEXITSTATUS(status)
+
+
+def _read_spooled(f, text):
+    f.seek(0)
+    data = f.read()
+    f.close()
+    if text:
+        import locale
+        return data.decode(locale.getpreferredencoding(False), errors='replace')
+    return data
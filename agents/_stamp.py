@@ -0,0 +1,125 @@
+"""Content-hash stamps that let agents skip work whose inputs haven't changed.
+
+An agent hashes its input files together with the arguments that affect the
+output. When the digest matches the stamp left by the last successful run,
+the agent can skip the run.
+"""
+
+import hashlib
+import json
+import os
+
+CHUNK_SIZE = 64 * 1024
+# Files per process-pool task when hashing in parallel
+PARALLEL_CHUNK = 64
+
+
+def _scan(path, suffixes, exclude):
+    with os.scandir(path) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.name.startswith('.') or (exclude and os.path.realpath(entry.path) in exclude):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            yield from _scan(entry.path, suffixes, exclude)
+        elif entry.is_file() and (suffixes is None or entry.name.endswith(suffixes)):
+            yield entry.path
+
+
+def iter_files(inputs, suffixes=None, exclude=()):
+    """Yield the files under ``inputs`` in a stable order.
+
+    ``inputs`` may name files or directories. Directories are walked
+    recursively, skipping dot-entries and any path listed in ``exclude``.
+    If ``suffixes`` is given, only files ending in one of them are yielded.
+    """
+    # Resolved on both sides, so relative and absolute spellings both match
+    exclude = {os.path.realpath(path) for path in exclude}
+    for path in inputs:
+        if os.path.isfile(path):
+            yield path
+        elif os.path.isdir(path):
+            yield from _scan(path, suffixes, exclude)
+
+
+# (path, mtime_ns, size) -> digest, so repeated scans in one run don't rehash
+_digests = {}
+
+
+def _hash_file(f):
+    if hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(f, 'blake2b')
+    # Before Python 3.11: reuse one buffer instead of allocating per chunk
+    h = hashlib.blake2b()
+    buf = memoryview(bytearray(CHUNK_SIZE))
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            return h
+        h.update(buf[:n])
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _hash_path(path):
+    with open(path, 'rb', buffering=0) as f:
+        return _hash_file(f).hexdigest()
+
+
+def _hash_many(keys):
+    return [(key, _hash_path(key[0])) for key in keys]
+
+
+def digest_files(paths):
+    """Return ``{path: digest}`` for ``paths``, spreading cold hashing across cores.
+
+    Files are hashed in chunks of ``PARALLEL_CHUNK`` on a process pool when
+    more than one chunk needs hashing and several CPUs are available; small
+    or already-memoized sets are hashed in-process, where a pool would cost
+    more than it saves.
+    """
+    keys = [_file_key(path) for path in paths]
+    missing = [key for key in dict.fromkeys(keys) if key not in _digests]
+    workers = min(os.cpu_count() or 1, -(-len(missing) // PARALLEL_CHUNK))
+    if workers > 1:
+        # Imported here: pulling in multiprocessing costs more than a no-op run
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = [missing[i:i + PARALLEL_CHUNK] for i in range(0, len(missing), PARALLEL_CHUNK)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for pairs in pool.map(_hash_many, chunks):
+                _digests.update(pairs)
+    else:
+        _digests.update(_hash_many(missing))
+    return {key[0]: _digests[key] for key in keys}
+
+
+def compute_digest(files, args):
+    """Merkle-style root over (path, file digest) pairs plus ``args``."""
+    files = list(files)
+    digests = digest_files(files)
+    root = hashlib.blake2b()
+    for path in files:
+        root.update(path.encode('utf-8') + b'\0')
+        root.update(digests[path].encode('ascii') + b'\n')
+    root.update(json.dumps(args, sort_keys=True).encode('utf-8'))
+    return root.hexdigest()
+
+
+def is_fresh(stamp_path, digest):
+    try:
+        with open(stamp_path) as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return stamp.get('digest') == digest and stamp.get('returncode') == 0
+
+
+def write_stamp(stamp_path, digest, args):
+    tmp_path = stamp_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'digest': digest, 'args': args, 'returncode': 0}, f)
+    os.replace(tmp_path, stamp_path)
@@ -0,0 +1,99 @@
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+AGENTS = Path(__file__).parent.parent
+LAUNCHER = AGENTS / 'metalos-agent'
+
+sys.path.insert(0, str(AGENTS))
+import _daemon  # noqa: E402
+
+
+def start_daemon(agents_dir, env):
+    daemon = subprocess.Popen(
+        [sys.executable, str(agents_dir / '_daemon.py'), '--serve'], env=env
+    )
+    runtime_dir = Path(env['XDG_RUNTIME_DIR'])
+    before = set(runtime_dir.glob('metalos-agentd-*/agentd.sock'))
+    deadline = time.monotonic() + 10
+    while not set(runtime_dir.glob('metalos-agentd-*/agentd.sock')) - before:
+        assert daemon.poll() is None, 'agentd exited during startup'
+        assert time.monotonic() < deadline, 'agentd did not start'
+        time.sleep(0.02)
+    return daemon
+
+
+@pytest.fixture
+def runtime_env():
+    # Short base dir: AF_UNIX socket paths are limited to ~100 bytes
+    runtime_dir = tempfile.mkdtemp(prefix='agentd-', dir='/tmp')
+    daemons = []
+    yield dict(os.environ, XDG_RUNTIME_DIR=runtime_dir), daemons
+    for daemon in daemons:
+        daemon.terminate()
+        daemon.wait(timeout=5)
+    shutil.rmtree(runtime_dir)
+
+
+@pytest.fixture
+def agentd_env(runtime_env):
+    env, daemons = runtime_env
+    daemons.append(start_daemon(AGENTS, env))
+    return env
+
+
+def run_launcher(env, *args, launcher=LAUNCHER):
+    return subprocess.run(
+        [sys.executable, str(launcher), *args], env=env, capture_output=True, text=True
+    )
+
+
+def test_runs_agent_through_daemon(agentd_env):
+    result = run_launcher(agentd_env, 'ExampleAgent', '-m', 'X')
+    assert result.returncode == 0
+    assert result.stdout.strip() == 'X'
+
+
+def test_propagates_agent_exit_code(agentd_env):
+    result = run_launcher(agentd_env, 'ExampleAgent', '--bogus')
+    assert result.returncode == 2
+    assert 'unrecognized arguments: --bogus' in result.stderr
+
+
+def test_unknown_agent(agentd_env):
+    result = run_launcher(agentd_env, 'NoSuchAgent')
+    assert result.returncode == 2
+    assert result.stdout == ''
+    assert 'Unknown agent: NoSuchAgent' in result.stderr
+
+
+def test_each_checkout_gets_its_own_daemon(runtime_env, tmp_path):
+    env, daemons = runtime_env
+    copy = tmp_path / 'agents'
+    shutil.copytree(AGENTS, copy, ignore=shutil.ignore_patterns('__pycache__'))
+    main_py = copy / 'ExampleAgent' / 'main.py'
+    main_py.write_text(main_py.read_text().replace('Hello from ExampleAgent!', 'Hello from the copy!'))
+    daemons.append(start_daemon(AGENTS, env))
+    daemons.append(start_daemon(copy, env))
+
+    original = run_launcher(env, 'ExampleAgent')
+    copied = run_launcher(env, 'ExampleAgent', launcher=copy / 'metalos-agent')
+    assert original.stdout.strip() == 'Hello from ExampleAgent!'
+    assert copied.stdout.strip() == 'Hello from the copy!'
+
+
+@pytest.mark.skipif(not hasattr(socket, 'SO_PEERCRED'), reason='needs SO_PEERCRED')
+def test_check_peer_rejects_other_uid(monkeypatch):
+    a, b = socket.socketpair()
+    with a, b:
+        _daemon._check_peer(a)
+        monkeypatch.setattr(os, 'getuid', lambda: os.geteuid() + 1)
+        with pytest.raises(PermissionError):
+            _daemon._check_peer(a)
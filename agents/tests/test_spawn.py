@@ -0,0 +1,47 @@
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import _spawn  # noqa: E402
+
+
+def py(code):
+    return [sys.executable, '-c', code]
+
+
+@pytest.fixture(params=['waitid', 'wait'])
+def reaper(request, monkeypatch):
+    # Exercise the os.wait() fallback used where os.waitid is missing
+    if request.param == 'wait':
+        monkeypatch.delattr(os, 'waitid', raising=False)
+    return request.param
+
+
+def test_run_all_exit_codes(reaper):
+    results = dict(_spawn.run_all([py('pass'), py('import sys; sys.exit(3)')]))
+    assert results[0].returncode == 0
+    assert results[1].returncode == 3
+
+
+def test_run_all_signal_gives_negative_returncode(reaper):
+    cmd = py('import os, signal; os.kill(os.getpid(), signal.SIGKILL)')
+    [(index, ret)] = list(_spawn.run_all([cmd]))
+    assert index == 0
+    assert ret.returncode == -signal.SIGKILL
+
+
+def test_run_all_captures_output(reaper):
+    cmd = py('import sys; print("out"); print("err", file=sys.stderr)')
+    [(_, ret)] = list(_spawn.run_all([cmd], capture_output=True, text=True))
+    assert ret.stdout.strip() == 'out'
+    assert ret.stderr.strip() == 'err'
+    assert ret.args == cmd
+
+
+def test_run_all_yields_in_completion_order(reaper):
+    cmds = [py('import time; time.sleep(0.5)'), py('pass')]
+    assert [index for index, _ in _spawn.run_all(cmds)] == [1, 0]
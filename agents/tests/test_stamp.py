@@ -0,0 +1,89 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import _stamp  # noqa: E402
+
+
+def make_tree(root):
+    (root / 'src').mkdir()
+    (root / 'src' / 'a.c').write_text('int a;\n')
+    (root / 'src' / 'b.h').write_text('int b;\n')
+    (root / 'src' / '.hidden').write_text('x\n')
+    (root / 'src' / 'out').mkdir()
+    (root / 'src' / 'out' / 'gen.c').write_text('int gen;\n')
+
+
+def digest(root, args=None):
+    return _stamp.compute_digest(_stamp.iter_files([str(root / 'src')]), args or {})
+
+
+def test_stamp_matches_after_write(tmp_path):
+    make_tree(tmp_path)
+    stamp = str(tmp_path / 'stamp')
+    d = digest(tmp_path)
+    assert not _stamp.is_fresh(stamp, d)
+    _stamp.write_stamp(stamp, d, {})
+    assert _stamp.is_fresh(stamp, d)
+    assert _stamp.is_fresh(stamp, digest(tmp_path))
+
+
+def test_content_change_breaks_match(tmp_path):
+    make_tree(tmp_path)
+    stamp = str(tmp_path / 'stamp')
+    _stamp.write_stamp(stamp, digest(tmp_path), {})
+    # Different size, so the (mtime, size) memo can't mask the change
+    (tmp_path / 'src' / 'a.c').write_text('int a = 1;\n')
+    assert not _stamp.is_fresh(stamp, digest(tmp_path))
+
+
+def test_args_change_breaks_match(tmp_path):
+    make_tree(tmp_path)
+    stamp = str(tmp_path / 'stamp')
+    _stamp.write_stamp(stamp, digest(tmp_path, {'config': 'Debug'}), {})
+    assert _stamp.is_fresh(stamp, digest(tmp_path, {'config': 'Debug'}))
+    assert not _stamp.is_fresh(stamp, digest(tmp_path, {'config': 'Release'}))
+    assert not _stamp.is_fresh(stamp, digest(tmp_path, {'config': 'Debug', 'env': {'CC': 'clang'}}))
+
+
+def test_corrupt_stamp_is_not_fresh(tmp_path):
+    make_tree(tmp_path)
+    stamp = tmp_path / 'stamp'
+    stamp.write_text('{not json')
+    assert not _stamp.is_fresh(str(stamp), digest(tmp_path))
+
+
+def test_iter_files_skips_dot_and_excluded_paths(tmp_path, monkeypatch):
+    make_tree(tmp_path)
+    src = str(tmp_path / 'src')
+    names = [os.path.relpath(p, src) for p in _stamp.iter_files([src])]
+    assert names == ['a.c', 'b.h', os.path.join('out', 'gen.c')]
+
+    # Excluded by absolute path even though the input is relative
+    monkeypatch.chdir(tmp_path)
+    files = list(_stamp.iter_files(['src'], exclude=[str(tmp_path / 'src' / 'out')]))
+    assert files == [os.path.join('src', 'a.c'), os.path.join('src', 'b.h')]
+
+    assert list(_stamp.iter_files(['src'], suffixes=('.h',))) == [os.path.join('src', 'b.h')]
+
+
+def test_pool_and_in_process_digests_match(tmp_path, monkeypatch):
+    paths = []
+    for i in range(10):
+        path = tmp_path / f'f{i}.c'
+        path.write_bytes(b'x' * i * 1000)
+        paths.append(str(path))
+    # Force the pool path even on a single-CPU runner
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+
+    monkeypatch.setattr(_stamp, 'PARALLEL_CHUNK', 2)
+    monkeypatch.setattr(_stamp, '_digests', {})
+    pooled = _stamp.digest_files(paths)
+
+    monkeypatch.setattr(_stamp, 'PARALLEL_CHUNK', 64)
+    monkeypatch.setattr(_stamp, '_digests', {})
+    in_process = _stamp.digest_files(paths)
+
+    assert pooled == in_process
+    assert len(set(pooled.values())) == len(paths)